@@ -0,0 +1,159 @@
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from converter import ES2CXConverter
+from utils.extract_zip import extract_zip
+from utils.synthetic_agent import add_generator_arguments, generate_es_agent, generator_kwargs
+from verify_conversion import verify_conversion
+
+class _OfflineEntityTypesClient:
+    """Answers entity lookups from the synthetic agent without calling Dialogflow"""
+    def __init__(self, entity_names, agent_path):
+        self.entity_types = [
+            SimpleNamespace(display_name=name, name=f"{agent_path}/entityTypes/{name}")
+            for name in entity_names
+        ]
+
+    def list_entity_types(self, parent=None, request=None):
+        return list(self.entity_types)
+
+class _OfflineIntentsClient:
+    """Accepts intent protos without calling Dialogflow"""
+    def create_intent(self, parent=None, intent=None, request=None):
+        request = request or {"parent": parent, "intent": intent}
+        display_name = request["intent"].display_name
+        return SimpleNamespace(name=f"{request['parent']}/intents/{display_name}", display_name=display_name)
+
+    def update_intent(self, intent=None, update_mask=None, request=None):
+        request = request or {"intent": intent}
+        return request["intent"]
+
+def _measure(name, phrases, func, trace_memory=True):
+    """Time one stage, then rerun it under tracemalloc for peak memory, with stdout silenced"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+
+    # Stages report failures with ❌ instead of raising, timing the error path is meaningless
+    failures = [line for line in output.getvalue().splitlines() if line.lstrip().startswith("❌")]
+    if failures:
+        raise RuntimeError(f"{name} stage reported {len(failures)} failures, first: {failures[0]}")
+
+    # tracemalloc slows allocation-heavy code several times over, so it gets its own run
+    peak = 0
+    if trace_memory:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    stats = {
+        "seconds": round(elapsed, 4),
+        "phrases_per_sec": round(phrases / elapsed, 1) if elapsed else 0.0,
+        "peak_mb": round(peak / (1024 * 1024), 2)
+    }
+    print(f"⏱️ {name:<16} {stats['seconds']:>9.3f}s {stats['phrases_per_sec']:>12.1f} phrases/s {stats['peak_mb']:>9.2f} MB peak")
+    return stats, result
+
+def run_benchmarks(work_dir, counts, zip_path):
+    """Run every pipeline stage against an already generated ES export"""
+    extract_dir = Path(work_dir) / "extracted"
+    output_dir = Path(work_dir) / "output_cx"
+    phrases = counts["phrases"]
+    results = {}
+
+    results["extract"], _ = _measure("extract", phrases, lambda: extract_zip(str(zip_path), str(extract_dir)))
+
+    converter = ES2CXConverter(input_dir=extract_dir, output_dir=output_dir)
+    results["convert"], converted = _measure("convert", phrases, lambda: {
+        lang: converter.convert_all(lang) for lang in converter.languages
+    })
+    results["write_bundle"], _ = _measure("write_bundle", phrases, lambda: [
+        converter.write_output(*shard, lang) for lang, shard in converted.items()
+    ] + [converter.write_manifest()])
+    results["validate"], _ = _measure("validate", phrases, lambda: verify_conversion(str(output_dir)))
+    # Forked shard workers would inherit tracemalloc, so only time it
+    results["process_all"], _ = _measure("process_all", phrases, converter.process_all, trace_memory=False)
+
+    try:
+        from utils.convert_intents import convert_intents
+    except ImportError as e:
+        print(f"⏩ Skipping convert_intents stage: {e}")
+    else:
+        agent_path = "projects/benchmark/locations/global/agents/benchmark"
+        entity_names = [e.display_name for e in converted[converter.default_language][0]]
+        results["convert_intents"], _ = _measure("convert_intents", phrases, lambda: convert_intents(
+            _OfflineIntentsClient(),
+            agent_path,
+            str(extract_dir / "intents"),
+            "benchmark",
+            _OfflineEntityTypesClient(entity_names, agent_path)
+        ))
+
+    return results
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return the stages that got slower or hungrier than the baseline allows"""
+    regressions = []
+    for stage, stats in results.items():
+        if stage not in baseline:
+            continue
+        base = baseline[stage]
+        if base["phrases_per_sec"] and stats["phrases_per_sec"] < base["phrases_per_sec"] * (1 - tolerance):
+            regressions.append(f"{stage}: {stats['phrases_per_sec']} phrases/s vs baseline {base['phrases_per_sec']}")
+        if base["peak_mb"] and stats["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{stage}: {stats['peak_mb']} MB peak vs baseline {base['peak_mb']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ES to CX conversion pipeline on a synthetic agent")
+    add_generator_arguments(parser)
+    parser.add_argument("--baseline", help="Compare results against this baseline JSON file")
+    parser.add_argument("--save-baseline", help="Write results to this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="es2cx_bench_")
+    try:
+        zip_path = Path(work_dir) / "agent.zip"
+        params = generator_kwargs(args)
+        counts = generate_es_agent(zip_path, **params)
+        print(f"🧪 Synthetic agent: {counts}")
+
+        results = run_benchmarks(work_dir, counts, zip_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"params": params, "counts": counts, "stages": results}
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print("⚠️ Baseline was recorded with different generator parameters")
+        regressions = compare_to_baseline(results, baseline["stages"], args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
+
+from utils.languages import detect_languages
+from utils.model import EntityType, Intent
+from utils.param_index import ParameterIndex, build_parameter_index, correct_name
+from utils.profiling import profile_phase
+
+def _convert_shard(input_dir: str, output_dir: str, language_code: str, parameter_index: ParameterIndex) -> Dict:
+    """Convert one language shard in a worker process"""
+    return ES2CXConverter(input_dir, output_dir, parameter_index).convert_language(language_code)
 
 class ES2CXConverter:
-    def __init__(self):
-        self.input_dir = Path("extracted")
-        self.output_dir = Path("output_cx")
-        self.output_dir.mkdir(exist_ok=True)
+    def __init__(self, input_dir: str = "extracted", output_dir: str = "output_cx", parameter_index: ParameterIndex = None):
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.languages = detect_languages(str(self.input_dir))
+        self.default_language = self.languages[0]
+        self._parameter_index = parameter_index
+
+    @property
+    def parameter_index(self) -> ParameterIndex:
+        """Alias to entity index of the whole export, built once before any intent resolves"""
+        if self._parameter_index is None:
+            intents_dir = self.input_dir / "intents"
+            self._parameter_index = build_parameter_index(str(intents_dir)) if intents_dir.is_dir() else ParameterIndex()
+        return self._parameter_index
 
     def _load_json(self, file_path: Path) -> Dict:
         """Load JSON file with UTF-8 encoding"""
@@ -19,132 +40,156 @@ class ES2CXConverter:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
-    def convert_entity(self, entity_file: Path) -> Dict:
+    def convert_entity(self, entity_file: Path, language_code: str = "id") -> EntityType:
         """Convert ES entity to CX format"""
         try:
-            base_name = entity_file.stem.replace('_entries_id', '')
-            entries_file = entity_file.parent / f"{base_name}_entries_id.json"
+            base_name = entity_file.stem.replace(f'_entries_{language_code}', '')
+            entries_file = entity_file.parent / f"{base_name}_entries_{language_code}.json"
             
             if not entries_file.exists():
                 print(f"⚠️ No entries file for {base_name}")
                 return None
 
-            entries = self._load_json(entries_file)
-            return {
-                "display_name": base_name.lower(),
-                "kind": "KIND_MAP",
-                "entities": [
-                    {
-                        "value": entry["value"],
-                        "synonyms": entry.get("synonyms", [])
-                    }
-                    for entry in entries
-                    if isinstance(entry, dict) and "value" in entry
-                ]
-            }
+            return EntityType.from_es(correct_name(base_name), self._load_json(entries_file), language_code)
         except Exception as e:
             print(f"❌ Error converting {entity_file.name}: {str(e)}")
             return None
 
-    def convert_intent(self, intent_file: Path) -> Dict:
+    def convert_intent(self, intent_file: Path, language_code: str = "id") -> Intent:
         """Convert ES intent to CX format"""
         try:
-            intent_data = self._load_json(intent_file)
             base_name = intent_file.stem
-            user_says_file = intent_file.parent / f"{base_name}_usersays_id.json"
+            user_says_file = intent_file.parent / f"{base_name}_usersays_{language_code}.json"
 
             if not user_says_file.exists():
                 print(f"⚠️ No training phrases for {base_name}")
                 return None
 
-            # Process training phrases
-            user_says = self._load_json(user_says_file)
-            training_phrases = []
-            parameters = set()
-
-            for phrase in user_says:
-                parts = []
-                for part in phrase.get("data", []):
-                    text = part.get("text", "").strip()
-                    if not text:
-                        continue
-
-                    if part.get("alias"):
-                        param_id = part["alias"].lower().replace(" ", "_")
-                        parts.append({
-                            "text": text,
-                            "parameter_id": param_id
-                        })
-                        parameters.add(param_id)
-                    else:
-                        parts.append({"text": text})
-
-                if parts:
-                    training_phrases.append({
-                        "parts": parts,
-                        "repeat_count": 1
-                    })
-
-            # Build CX intent
-            cx_intent = {
-                "display_name": base_name,
-                "training_phrases": training_phrases
-            }
-
-            # Add parameters if found
-            if parameters:
-                cx_intent["parameters"] = [
-                    {
-                        "id": param,
-                        "entity_type": f"@sys.any",  # Will be replaced later
-                        "is_list": False
-                    }
-                    for param in parameters
-                ]
-
-            return cx_intent
+            return Intent.from_es(
+                correct_name(base_name),
+                self._load_json(user_says_file),
+                language_code,
+                lambda param_id: self.parameter_index.resolve(base_name, param_id)
+            )
 
         except Exception as e:
             print(f"❌ Error converting {intent_file.name}: {str(e)}")
             return None
 
-    def process_all(self):
-        """Process all entities and intents"""
-        print("🔄 Starting conversion from ES to CX format...")
-        
-        # Convert entities
-        entities_dir = self.output_dir / "entities"
-        entities_dir.mkdir(exist_ok=True)
-
-        print("\n🔍 Processing entities...")
-        entity_files = list(self.input_dir.glob("entities/*.json"))
-        for entity_file in entity_files:
-            if "_entries_id" not in entity_file.name:
-                continue
-                
-            cx_entity = self.convert_entity(entity_file)
-            if cx_entity and cx_entity["entities"]:
-                output_path = entities_dir / f"{cx_entity['display_name']}.json"
-                self._save_json(cx_entity, output_path)
-                print(f"✅ Converted {cx_entity['display_name']} ({len(cx_entity['entities'])} entries)")
-
-        # Convert intents
-        intents_dir = self.output_dir / "intents"
-        intents_dir.mkdir(exist_ok=True)
-
-        print("\n🔍 Processing intents...")
-        intent_files = list(self.input_dir.glob("intents/*.json"))
-        for intent_file in intent_files:
+    def iter_entities(self, language_code: str = None) -> Iterator[EntityType]:
+        """Yield converted entities of one language as soon as each is ready"""
+        language_code = language_code or self.default_language
+        print(f"\n🔍 Processing entities [{language_code}]...")
+        for entity_file in self.input_dir.glob(f"entities/*_entries_{language_code}.json"):
+            cx_entity = self.convert_entity(entity_file, language_code)
+            if cx_entity and cx_entity.entities:
+                print(f"✅ Converted {cx_entity.display_name} ({len(cx_entity.entities)} entries)")
+                yield cx_entity
+
+    def iter_intents(self, language_code: str = None) -> Iterator[Intent]:
+        """Yield converted intents of one language as soon as each is ready"""
+        language_code = language_code or self.default_language
+        print(f"\n🔍 Processing intents [{language_code}]...")
+        for intent_file in self.input_dir.glob("intents/*.json"):
             if "_usersays_" in intent_file.name:
                 continue
 
-            cx_intent = self.convert_intent(intent_file)
-            if cx_intent and cx_intent["training_phrases"]:
-                output_path = intents_dir / f"{cx_intent['display_name']}.json"
-                self._save_json(cx_intent, output_path)
-                print(f"✅ Converted {cx_intent['display_name']} ({len(cx_intent['training_phrases'])} phrases)")
+            cx_intent = self.convert_intent(intent_file, language_code)
+            if cx_intent and cx_intent.training_phrases:
+                print(f"✅ Converted {cx_intent.display_name} ({len(cx_intent.training_phrases)} phrases)")
+                yield cx_intent
 
-        print("\n🎉 Conversion completed! Results in 'output_cx' folder")
+    def iter_intent_groups(self) -> Iterator[List[Intent]]:
+        """Yield each intent converted in every language, default language first"""
+        print(f"\n🔍 Processing intents [{', '.join(self.languages)}]...")
+        for intent_file in self.input_dir.glob("intents/*.json"):
+            if "_usersays_" in intent_file.name:
+                continue
+
+            group = []
+            for language_code in self.languages:
+                cx_intent = self.convert_intent(intent_file, language_code)
+                if cx_intent and cx_intent.training_phrases:
+                    print(f"✅ Converted {cx_intent.display_name} [{language_code}] ({len(cx_intent.training_phrases)} phrases)")
+                    group.append(cx_intent)
+            if group:
+                yield group
+
+    def convert_all(self, language_code: str = None) -> Tuple[List[EntityType], List[Intent]]:
+        """Convert all entities and intents of one language in memory"""
+        language_code = language_code or self.default_language
+        with profile_phase(f"convert_entities_{language_code}"):
+            cx_entities = list(self.iter_entities(language_code))
+        # Loading usersays and building phrases happen per intent file
+        with profile_phase(f"build_phrases_{language_code}"):
+            cx_intents = list(self.iter_intents(language_code))
+        return cx_entities, cx_intents
+
+    def save_entity(self, cx_entity: EntityType):
+        """Write one converted entity to its language's output folder"""
+        entities_dir = self.output_dir / (cx_entity.language_code or self.default_language) / "entities"
+        entities_dir.mkdir(parents=True, exist_ok=True)
+        self._save_json(cx_entity.to_dict(), entities_dir / f"{cx_entity.display_name}.json")
+
+    def save_intent(self, cx_intent: Intent):
+        """Write one converted intent to its language's output folder"""
+        intents_dir = self.output_dir / (cx_intent.language_code or self.default_language) / "intents"
+        intents_dir.mkdir(parents=True, exist_ok=True)
+        self._save_json(cx_intent.to_dict(), intents_dir / f"{cx_intent.display_name}.json")
+
+    def write_output(self, cx_entities: List[EntityType], cx_intents: List[Intent], language_code: str = None):
+        """Write converted entities and intents to the language's output folder"""
+        shard_dir = self.output_dir / (language_code or self.default_language)
+        (shard_dir / "entities").mkdir(parents=True, exist_ok=True)
+        (shard_dir / "intents").mkdir(parents=True, exist_ok=True)
+        for cx_entity in cx_entities:
+            self.save_entity(cx_entity)
+        for cx_intent in cx_intents:
+            self.save_intent(cx_intent)
+
+    def write_manifest(self):
+        """Record the converted languages so deployment knows the default one"""
+        self._save_json(
+            {"default_language": self.default_language, "languages": self.languages},
+            self.output_dir / "languages.json"
+        )
+
+    def convert_language(self, language_code: str) -> Dict:
+        """Convert and write one language shard"""
+        cx_entities, cx_intents = self.convert_all(language_code)
+        with profile_phase(f"write_output_{language_code}"):
+            self.write_output(cx_entities, cx_intents, language_code)
+        return {
+            "language_code": language_code,
+            "entities": len(cx_entities),
+            "intents": len(cx_intents),
+            "phrases": sum(len(i.training_phrases) for i in cx_intents)
+        }
+
+    def process_all(self, max_workers: int = None):
+        """Process all entities and intents, one parallel shard per language"""
+        print("🔄 Starting conversion from ES to CX format...")
+        print(f"🌐 Languages: {', '.join(self.languages)} (default: {self.default_language})")
+        # Every shard resolves against the same complete index
+        parameter_index = self.parameter_index
+
+        if len(self.languages) == 1:
+            results = [self.convert_language(self.default_language)]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers or len(self.languages)) as pool:
+                results = list(pool.map(
+                    _convert_shard,
+                    [str(self.input_dir)] * len(self.languages),
+                    [str(self.output_dir)] * len(self.languages),
+                    self.languages,
+                    [parameter_index] * len(self.languages)
+                ))
+        self.write_manifest()
+
+        for result in results:
+            print(f"📦 [{result['language_code']}] {result['entities']} entities, "
+                  f"{result['intents']} intents, {result['phrases']} phrases")
+        print(f"\n🎉 Conversion completed! Results in '{self.output_dir}' folder")
 
 if __name__ == "__main__":
     converter = ES2CXConverter()
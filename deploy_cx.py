@@ -1,9 +1,17 @@
 from google.cloud import dialogflowcx_v3beta1 as df
 from google.oauth2 import service_account
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 from typing import Dict, List
+from utils.model import EntityType, Intent, Parameter
+from utils.param_index import cx_entity_type
+from utils.profiling import profile_phase
+from utils.train_flows import train_flows, training_failed
+from utils.verify_deployment import PAGE_SIZE, verify_deployment
+from verify_conversion import load_languages, load_local
 
 class CXDeployer:
     def __init__(self, config_path: str = "config.json"):
@@ -20,210 +28,254 @@ class CXDeployer:
             f"projects/{self.config['project_id']}/locations/{self.config['location']}"
             f"/agents/{self.config['agent_id']}"
         )
+        self.output_dir = Path(self.config.get("output_dir", "output_cx"))
+        # Display name to resource name of what the agent already has, see load_existing
+        self._existing = None
 
-    def _get_existing_entity(self, display_name: str):
+    def load_existing(self):
+        """List the agent's entity types and intents once, deploys then look names up here"""
         entity_client = df.EntityTypesClient(
             credentials=self.credentials,
             client_options=self.client_options
         )
-        for entity in entity_client.list_entity_types(parent=self.agent_path):
-            if entity.display_name == display_name:
-                return entity
-        return None
-
-    def _get_existing_intent(self, display_name: str):
         intent_client = df.IntentsClient(
             credentials=self.credentials,
             client_options=self.client_options
         )
-        for intent in intent_client.list_intents(parent=self.agent_path):
-            if intent.display_name == display_name:
-                return intent
-        return None
+        self._existing = {
+            "entities": {
+                e.display_name: e.name
+                for e in entity_client.list_entity_types(request={"parent": self.agent_path, "page_size": PAGE_SIZE})
+            },
+            "intents": {
+                i.display_name: i.name
+                for i in intent_client.list_intents(request={"parent": self.agent_path, "page_size": PAGE_SIZE})
+            }
+        }
+
+    def _get_existing_entity(self, display_name: str) -> str:
+        if self._existing is None:
+            self.load_existing()
+        return self._existing["entities"].get(display_name)
+
+    def _get_existing_intent(self, display_name: str) -> str:
+        if self._existing is None:
+            self.load_existing()
+        return self._existing["intents"].get(display_name)
+
+    def deploy_entity(self, entity_file: Path, language_code: str = None) -> str:
+        with open(entity_file, 'r', encoding='utf-8') as f:
+            return self.deploy_entity_type(EntityType.from_dict(json.load(f)), language_code)
 
-    def deploy_entity(self, entity_file: Path) -> str:
+    def deploy_entity_type(self, cx_entity: EntityType, language_code: str = None) -> str:
         entity_client = df.EntityTypesClient(
             credentials=self.credentials,
             client_options=self.client_options
         )
 
-        with open(entity_file, 'r', encoding='utf-8') as f:
-            entity_data = json.load(f)
-
-        display_name = entity_data["display_name"]
+        display_name = cx_entity.display_name
+        language_code = language_code or cx_entity.language_code
         existing_entity = self._get_existing_entity(display_name)
 
-        entity_type = df.EntityType(
-            display_name=display_name,
-            kind=entity_data["kind"],
-            entities=[
-                df.EntityType.Entity(value=e["value"], synonyms=e["synonyms"])
-                for e in entity_data["entities"]
-            ]
-        )
+        entity_type = cx_entity.to_proto(df)
 
         try:
             if existing_entity:
-                entity_type.name = existing_entity.name
-                response = entity_client.update_entity_type(
-                    entity_type=entity_type,
-                    update_mask={"paths": ["entities"]}
-                )
-                print(f"✅ Entity updated: {response.display_name}")
+                entity_type.name = existing_entity
+                response = entity_client.update_entity_type(request={
+                    "entity_type": entity_type,
+                    "language_code": language_code,
+                    "update_mask": {"paths": ["entities"]}
+                })
+                print(f"✅ Entity updated [{language_code}]: {response.display_name}")
             else:
-                response = entity_client.create_entity_type(
-                    parent=self.agent_path,
-                    entity_type=entity_type
-                )
-                print(f"✅ Entity created: {response.display_name}")
+                response = entity_client.create_entity_type(request={
+                    "parent": self.agent_path,
+                    "entity_type": entity_type,
+                    "language_code": language_code
+                })
+                self._existing["entities"][display_name] = response.name
+                print(f"✅ Entity created [{language_code}]: {response.display_name}")
             return response.name
         except Exception as e:
             print(f"❌ Failed to deploy {display_name}: {str(e)}")
             return None
 
-    def deploy_intent(self, intent_file: Path, entity_map: Dict[str, str]) -> str:
+    def _load_intent(self, intent_file: Path) -> Intent:
+        with open(intent_file, 'r', encoding='utf-8') as f:
+            return Intent.from_dict(json.load(f))
+
+    def deploy_intent(self, intent_file: Path, entity_map: Dict[str, str], language_code: str = None) -> str:
+        return self.deploy_cx_intent(self._load_intent(intent_file), entity_map, language_code)
+
+    def deploy_cx_intent(self, cx_intent: Intent, entity_map: Dict[str, str], language_code: str = None) -> str:
         intent_client = df.IntentsClient(
             credentials=self.credentials,
             client_options=self.client_options
         )
 
-        with open(intent_file, 'r', encoding='utf-8') as f:
-            intent_data = json.load(f)
-
-        display_name = intent_data["display_name"]
+        display_name = cx_intent.display_name
+        language_code = language_code or cx_intent.language_code
         existing_intent = self._get_existing_intent(display_name)
 
+        # Entities were resolved from the ES definitions at conversion time
         parameters = []
-        param_ids = []
-        
-        if "parameters" in intent_data:
-            for param in intent_data["parameters"]:
-                param_id = param["id"]
-                entity_type = param.get("entity_type", "")
-                
-                # Handle location specially
-                if param_id == "location":
-                    if "location" in entity_map:
-                        parameters.append(df.Intent.Parameter(
-                            id=param_id,
-                            entity_type=entity_map["location"],
-                            is_list=param.get("is_list", False)
-                        ))
-                        param_ids.append(param_id)
-                        print(f"🔧 Using custom entity for location parameter")
-                    else:
-                        print(f"⚠️ Location entity not found, using sys.location")
-                        parameters.append(df.Intent.Parameter(
-                            id=param_id,
-                            entity_type="sys.location",
-                            is_list=param.get("is_list", False)
-                        ))
-                        param_ids.append(param_id)
-                # Handle @sys.any conversion
-                elif entity_type == "@sys.any":
-                    if param_id in entity_map:
-                        parameters.append(df.Intent.Parameter(
-                            id=param_id,
-                            entity_type=entity_map[param_id],
-                            is_list=param.get("is_list", False)
-                        ))
-                        param_ids.append(param_id)
-                        print(f"🔧 Converted @sys.any to custom entity for {param_id}")
-                    else:
-                        print(f"⚠️ No entity mapping for {param_id}, skipping parameter")
-                elif param_id in entity_map:
-                    parameters.append(df.Intent.Parameter(
-                        id=param_id,
-                        entity_type=entity_map[param_id],
-                        is_list=param.get("is_list", False)
-                    ))
-                    param_ids.append(param_id)
-
-        training_phrases = []
-        for phrase in intent_data["training_phrases"]:
-            filtered_parts = []
-            for part in phrase["parts"]:
-                if "parameter_id" in part:
-                    if part["parameter_id"] in param_ids:
-                        filtered_parts.append(part)
-                    else:
-                        filtered_parts.append({"text": part["text"]})
-                        print(f"⚠️ Converted parameter '{part['parameter_id']}' to text")
-                else:
-                    filtered_parts.append(part)
-            
-            training_phrases.append({
-                "parts": filtered_parts,
-                "repeat_count": phrase.get("repeat_count", 1)
-            })
+        for param in cx_intent.parameters:
+            entity_type = cx_entity_type(param.entity_type, entity_map)
+            if entity_type:
+                parameters.append(Parameter(param.id, entity_type, param.is_list, param.redact))
+            else:
+                print(f"⚠️ Entity {param.entity_type} for {param.id} was not deployed, skipping parameter")
 
-        intent = df.Intent(
-            display_name=display_name,
-            training_phrases=[
-                df.Intent.TrainingPhrase(
-                    parts=[
-                        df.Intent.TrainingPhrase.Part(
-                            text=p["text"],
-                            parameter_id=p.get("parameter_id") if "parameter_id" in p else None
-                        )
-                        for p in phrase["parts"]
-                    ],
-                    repeat_count=phrase.get("repeat_count", 1)
-                )
-                for phrase in training_phrases
-            ],
-            parameters=parameters
-        )
+        cx_intent.parameters = parameters
+        for param_id in cx_intent.unbind_parameters({p.id for p in parameters}):
+            print(f"⚠️ Converted parameter '{param_id}' to text")
+
+        intent = cx_intent.to_proto(df)
 
         try:
             if existing_intent:
-                intent.name = existing_intent.name
-                response = intent_client.update_intent(
-                    intent=intent,
-                    update_mask={"paths": ["training_phrases", "parameters"]}
-                )
-                print(f"✅ Intent updated: {response.display_name}")
+                intent.name = existing_intent
+                response = intent_client.update_intent(request={
+                    "intent": intent,
+                    "language_code": language_code,
+                    "update_mask": {"paths": ["training_phrases", "parameters"]}
+                })
+                print(f"✅ Intent updated [{language_code}]: {response.display_name}")
             else:
-                response = intent_client.create_intent(
-                    parent=self.agent_path,
-                    intent=intent
-                )
-                print(f"✅ Intent created: {response.display_name}")
+                response = intent_client.create_intent(request={
+                    "parent": self.agent_path,
+                    "intent": intent,
+                    "language_code": language_code
+                })
+                self._existing["intents"][display_name] = response.name
+                print(f"✅ Intent created [{language_code}]: {response.display_name}")
             return response.name
         except Exception as e:
             print(f"❌ Failed to deploy {display_name}: {str(e)}")
             return None
 
-    def deploy_all(self):
+    def add_intent_language(self, cx_intent: Intent, parameter_ids, language_code: str = None) -> str:
+        """Add one language's training phrases to an intent created in the default language"""
+        intent_client = df.IntentsClient(
+            credentials=self.credentials,
+            client_options=self.client_options
+        )
+
+        display_name = cx_intent.display_name
+        language_code = language_code or cx_intent.language_code
+        existing_intent = self._get_existing_intent(display_name)
+        if not existing_intent:
+            print(f"⚠️ Intent {display_name} was not deployed, skipping [{language_code}] phrases")
+            return None
+
+        # Parameters are shared by every language, the default-language intent owns them
+        for param_id in cx_intent.unbind_parameters(parameter_ids):
+            print(f"⚠️ Converted parameter '{param_id}' to text [{language_code}]")
+
+        try:
+            response = intent_client.update_intent(request={
+                "intent": cx_intent.to_proto(df, name=existing_intent),
+                "language_code": language_code,
+                "update_mask": {"paths": ["training_phrases"]}
+            })
+            print(f"✅ Added [{language_code}] phrases: {response.display_name}")
+            return response.name
+        except Exception as e:
+            print(f"❌ Failed to add [{language_code}] phrases to {display_name}: {str(e)}")
+            return None
+
+    def verify(self, report_path: str = "deploy_report.json") -> Dict:
+        """Compare the deployed agent with output_cx using bulk list calls"""
+        default_language, languages = load_languages(str(self.output_dir))
+        return verify_deployment(
+            df.EntityTypesClient(credentials=self.credentials, client_options=self.client_options),
+            df.IntentsClient(credentials=self.credentials, client_options=self.client_options),
+            self.agent_path,
+            {lang: load_local(str(self.output_dir), lang) for lang in languages},
+            report_path
+        )
+
+    def train(self) -> bool:
+        """Retrain every flow's NLU model, True once all of them can serve traffic"""
+        flows_client = df.FlowsClient(credentials=self.credentials, client_options=self.client_options)
+        return not training_failed(train_flows(flows_client, self.agent_path))
+
+    def _deploy_languages(self, languages: List[str], deploy_shard):
+        """Deploy extra language shards in parallel once the default one exists"""
+        if not languages:
+            return
+        with ThreadPoolExecutor(max_workers=len(languages)) as pool:
+            list(pool.map(deploy_shard, languages))
+
+    def deploy_all(self) -> bool:
+        """Deploy output_cx, verify and train, True once the agent can serve traffic"""
         print("🚀 Starting deployment to Dialogflow CX...")
-        
-        # First deploy entities
-        entity_files = list(Path("output_cx/entities").glob("*.json"))
+        default_language, languages = load_languages(str(self.output_dir))
+        other_languages = [lang for lang in languages if lang != default_language]
+        print(f"🌐 Languages: {', '.join(languages)} (default: {default_language})")
+        self.load_existing()
+
+        # First deploy entities, default language creates them
+        entity_files = list((self.output_dir / default_language / "entities").glob("*.json"))
         entity_map = {}
         
         print("\n🔧 Deploying entities...")
         print("Found entity files:", [f.name for f in entity_files])  # Debug
         
-        for entity_file in entity_files:
-            entity_path = self.deploy_entity(entity_file)
-            if entity_path:
-                entity_name = entity_file.stem
-                entity_map[entity_name] = entity_path
-                print(f" - Mapped {entity_name} to {entity_path}")  # Debug
+        with profile_phase("deploy_entities"):
+            for entity_file in entity_files:
+                entity_path = self.deploy_entity(entity_file, default_language)
+                if entity_path:
+                    entity_name = entity_file.stem
+                    entity_map[entity_name] = entity_path
+                    print(f" - Mapped {entity_name} to {entity_path}")  # Debug
+
+            # Other languages only add their entries to the existing entity types
+            self._deploy_languages(other_languages, lambda lang: [
+                self.deploy_entity(entity_file, lang)
+                for entity_file in (self.output_dir / lang / "entities").glob("*.json")
+            ])
 
         print("\nFinal entity map:", entity_map)  # Debug
         print("\n⏳ Waiting for entities to propagate...")
         time.sleep(20)
 
-        intent_files = list(Path("output_cx/intents").glob("*.json"))
-        
+        # Every shard is loaded first, the default-language intent is created with all their parameters
+        shards = {
+            lang: {i.display_name: i for i in map(self._load_intent, (self.output_dir / lang / "intents").glob("*.json"))}
+            for lang in languages
+        }
+
         print("\n🔧 Deploying intents...")
-        for intent_file in intent_files:
-            self.deploy_intent(intent_file, entity_map)
+        parameter_ids = {}
+        with profile_phase("deploy_intents"):
+            for display_name, cx_intent in shards[default_language].items():
+                cx_intent.merge_parameters(shards[lang][display_name] for lang in other_languages if display_name in shards[lang])
+                if self.deploy_cx_intent(cx_intent, entity_map, default_language):
+                    parameter_ids[display_name] = {p.id for p in cx_intent.parameters}
+
+            # Other languages only add training phrases, never replace the shared parameters
+            self._deploy_languages(other_languages, lambda lang: [
+                self.add_intent_language(cx_intent, parameter_ids[display_name], lang)
+                for display_name, cx_intent in shards[lang].items()
+                if display_name in parameter_ids
+            ])
+
+        with profile_phase("verify_deployment"):
+            self.verify()
+
+        with profile_phase("train_flows"):
+            trained = self.train()
+        if not trained:
+            print("\n⛔ Deployment finished but some flows failed to train")
+            return False
 
         print("\n🎉 Deployment completed!")
         print(f"Agent URL: https://dialogflow.cloud.google.com/cx/projects/{self.config['project_id']}/locations/{self.config['location']}/agents/{self.config['agent_id']}")
+        return True
 
 if __name__ == "__main__":
     deployer = CXDeployer()
-    deployer.deploy_all()
\ No newline at end of file
+    if not deployer.deploy_all():
+        sys.exit(1)
\ No newline at end of file
@@ -8,29 +8,9 @@ from utils.extract_zip import extract_zip
 from utils.convert_intents import convert_intents, delete_all_intents
 from utils.convert_entities import convert_entities, delete_all_entities
 from utils.clean_flows import remove_transition_routes
-
-def verify_entity_fully_created(entity_client, agent_path, entity_name):
-    """Verify entity exists and is fully provisioned"""
-    max_retries = 5
-    retry_delay = 5  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            for entity in entity_client.list_entity_types(parent=agent_path):
-                if entity.display_name == entity_name:
-                    # Try to get the full entity details
-                    full_entity = entity_client.get_entity_type(name=entity.name)
-                    if full_entity:
-                        print(f"✓ Entity verified: {entity_name} (Attempt {attempt + 1})")
-                        return True
-            print(f"⚠️ Entity not found yet: {entity_name} (Attempt {attempt + 1})")
-        except Exception as e:
-            print(f"⚠️ Error checking entity {entity_name}: {str(e)}")
-        
-        if attempt < max_retries - 1:
-            time.sleep(retry_delay)
-    
-    return False
+from utils.profiling import profile_phase
+from utils.train_flows import train_flows, training_failed
+from utils.verify_deployment import has_differences, verify_deployment, wait_for_entities
 
 def main():
     # 🔐 Setup credentials
@@ -65,21 +45,24 @@ def main():
         
         # 📁 Extract ZIP
         print("\n🔍 Extracting ZIP file...")
-        extract_zip(ZIP_PATH, EXTRACT_PATH)
+        with profile_phase("extract"):
+            extract_zip(ZIP_PATH, EXTRACT_PATH)
 
         # 🧹 Clean transition routes
         print("\n🧹 Cleaning transition routes...")
-        remove_transition_routes(clients['flows'], agent_path)
+        with profile_phase("clean_agent"):
+            remove_transition_routes(clients['flows'], agent_path)
 
-        # 🗑️ Delete existing intents and entities
-        print("\n🗑️ Cleaning existing intents and entities...")
-        delete_all_intents(clients['intents'], agent_path, clients['flows'], clients['pages'])
-        delete_all_entities(clients['entities'], agent_path)
+            # 🗑️ Delete existing intents and entities
+            print("\n🗑️ Cleaning existing intents and entities...")
+            delete_all_intents(clients['intents'], agent_path, clients['flows'], clients['pages'])
+            delete_all_entities(clients['entities'], agent_path)
 
         # 🔄 Convert entities FIRST
         print("\n🔄 Converting entities...")
         entities_path = os.path.join(EXTRACT_PATH, "entities")
-        convert_entities(clients['entities'], agent_path, entities_path)
+        with profile_phase("deploy_entities"):
+            expected_entities = convert_entities(clients['entities'], agent_path, entities_path)
 
         # Add delay for entities to propagate
         print("\n⏳ Waiting 20 seconds for entities to propagate...")
@@ -87,22 +70,19 @@ def main():
 
         # Verifikasi entities telah dibuat
         print("\n🔍 Verifying created entities...")
-        required_entities = ['jenis_info_kiano', 'kiano_projects', 'location']
-        all_entities_ready = True
+        missing_entities = wait_for_entities(clients['entities'], agent_path, expected_entities)
         
-        for entity_name in required_entities:
-            if not verify_entity_fully_created(clients['entities'], agent_path, entity_name):
-                print(f"❌ Critical Error: Entity {entity_name} not fully provisioned!")
-                all_entities_ready = False
+        for entity_name in sorted(missing_entities):
+            print(f"❌ Critical Error: Entity {entity_name} not fully provisioned!")
         
-        if not all_entities_ready:
+        if missing_entities:
             print("⛔ Some entities failed to provision properly")
             sys.exit(1)
 
         # 🔄 Then convert intents with proper entity client reference
         print("\n🔄 Converting intents...")
         intents_path = os.path.join(EXTRACT_PATH, "intents")
-        convert_intents(
+        deployed_intents = convert_intents(
             clients['intents'], 
             agent_path, 
             intents_path, 
@@ -110,6 +90,25 @@ def main():
             clients['entities']  # Pass the entity client
         )
 
+        # 🔍 Bulk-verify deployed intents against what convert_intents sent
+        with profile_phase("verify_deployment"):
+            report = verify_deployment(
+                clients['entities'],
+                clients['intents'],
+                agent_path,
+                {lang: (None, intents) for lang, intents in deployed_intents.items()},
+                "deploy_report.json"
+            )
+        if has_differences(report):
+            print("⚠️ Deployed agent differs from the export, see deploy_report.json")
+
+        # 🧠 The agent only serves traffic once every flow has retrained
+        with profile_phase("train_flows"):
+            training = train_flows(clients['flows'], agent_path)
+        if training_failed(training):
+            print("⛔ Some flows failed to train")
+            sys.exit(1)
+
         print("\n✅ Migration completed successfully!")
     
     except Exception as e:
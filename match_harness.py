@@ -0,0 +1,87 @@
+import argparse
+import json
+
+from utils.match_harness import CXSessionsBackend, LocalBackend, build_cases, load_cases, run_load, save_cases, summarize
+from verify_conversion import load_languages, load_local, save_local_intents
+
+def make_backend(args, intents, language_code):
+    if args.backend == "local":
+        return LocalBackend(intents, latency=args.local_latency)
+
+    from google.cloud import dialogflowcx_v3beta1 as df
+    from deploy_cx import CXDeployer
+    deployer = CXDeployer(args.config)
+    sessions_client = df.SessionsClient(credentials=deployer.credentials, client_options=deployer.client_options)
+    return CXSessionsBackend(sessions_client, deployer.agent_path, language_code, method=args.backend)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay converted training phrases against an agent and report match accuracy and latency")
+    parser.add_argument("--output-dir", default="output_cx", help="Converted resources to replay")
+    parser.add_argument("--language", help="Language to replay (default: the agent's default language)")
+    parser.add_argument("--backend", choices=["local", "match", "detect"], default="local",
+                        help="local stand-in, or CX sessions match_intent / detect_intent")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--holdout", type=float,
+                        help="Hold out this fraction of phrases per intent (local backend, or with --exclude-holdout)")
+    parser.add_argument("--exclude-holdout", action="store_true",
+                        help="Rewrite output_cx without the held-out phrases and save them to --holdout-file")
+    parser.add_argument("--holdout-file", help="Held-out phrases saved by --exclude-holdout, replayed instead of output_cx")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, help="Replay at most this many phrases")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--qps", type=float, help="Target queries per second (default: as fast as possible)")
+    parser.add_argument("--local-latency", type=float, default=0.0, help="Simulated seconds per local match")
+    parser.add_argument("--report", default="match_report.json")
+    args = parser.parse_args()
+
+    if args.exclude_holdout and not (args.holdout and args.holdout_file):
+        parser.error("--exclude-holdout needs --holdout and --holdout-file")
+    if args.holdout and args.backend != "local" and not args.exclude_holdout:
+        # Sampling again here would pick phrases the deployed agent was trained on
+        parser.error("replay a deployed agent's holdout with --holdout-file")
+
+    default_language, _ = load_languages(args.output_dir)
+    language_code = args.language or default_language
+    replay_saved = args.holdout_file and not args.exclude_holdout
+    if replay_saved:
+        language_code, cases = load_cases(args.holdout_file)
+    _, intents = load_local(args.output_dir, language_code)
+    intents = list(intents.values())
+    if not replay_saved:
+        cases = build_cases(intents, args.holdout, args.seed)
+
+    if args.exclude_holdout:
+        save_local_intents(args.output_dir, language_code, intents)
+        save_cases(args.holdout_file, cases, language_code)
+        print(f"✂️ Removed {len(cases)} held-out phrases from {args.output_dir}/{language_code} "
+              f"and saved them to {args.holdout_file}, deploy before replaying")
+        return
+    if args.limit:
+        cases = cases[:args.limit]
+
+    backend = make_backend(args, intents, language_code)
+    rate = f"{args.qps} QPS" if args.qps else "unthrottled"
+    print(f"🎯 Replaying {len(cases)} phrases [{language_code}] on {args.backend} backend, "
+          f"concurrency {args.concurrency}, {rate}")
+    results, elapsed = run_load(backend, cases, args.concurrency, args.qps)
+    summary = summarize(results, elapsed)
+
+    print(f"\n✅ Top-1 accuracy: {summary['accuracy']:.2%} over {summary['requests']} requests "
+          f"({summary['errors']} errors, {summary['achieved_qps']} QPS achieved)")
+    latency = summary["latency_ms"]
+    print(f"⏱️ Latency ms: p50 {latency['p50']}  p90 {latency['p90']}  p95 {latency['p95']}  p99 {latency['p99']}")
+    worst = sorted(summary["per_intent"].items(), key=lambda item: item[1]["accuracy"])[:5]
+    print("\n📉 Lowest accuracy intents:")
+    for name, stats in worst:
+        print(f"  - {name}: {stats['accuracy']:.2%} ({stats['correct']}/{stats['total']})")
+    if summary["confusions"]:
+        print("\n🔀 Top confusions:")
+        for confusion in summary["confusions"]:
+            print(f"  - {confusion['expected']} → {confusion['predicted']}: {confusion['count']}")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"\n📝 Report written to {args.report}")
+
+if __name__ == "__main__":
+    main()
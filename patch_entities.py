@@ -2,11 +2,13 @@ import json
 from pathlib import Path
 
 def fix_empty_entities():
-    entities_dir = Path("output_cx/entities")
+    entities_dir = Path("output_cx/id/entities")
+    entities_dir.mkdir(parents=True, exist_ok=True)
     
     # Data manual untuk jenis_info_kiano
     jenis_info = {
         "display_name": "jenis_info_kiano",
+        "language_code": "id",
         "kind": "KIND_MAP",
         "entities": [
             {"value": "harga", "synonyms": ["biaya", "tarif"]},
@@ -18,6 +20,7 @@ def fix_empty_entities():
     # Data manual untuk kiano_projects
     kiano_projects = {
         "display_name": "kiano_projects",
+        "language_code": "id",
         "kind": "KIND_MAP",
         "entities": [
             {"value": "Kiano 1", "synonyms": ["Kiano Satu"]},
@@ -0,0 +1,24 @@
+import argparse
+import sys
+from converter import ES2CXConverter
+from deploy_cx import CXDeployer
+from utils.pipeline import run_streaming_pipeline
+from utils.profiling import profile_phase
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert and deploy to Dialogflow CX in one overlapping pipeline")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel deployment requests")
+    parser.add_argument("--queue-size", type=int, default=64, help="Converted resources buffered ahead of deployment")
+    args = parser.parse_args()
+
+    deployer = CXDeployer(args.config)
+    converter = ES2CXConverter(output_dir=str(deployer.output_dir))
+    # Only the dispatching thread is CPU-profiled here, conversion runs in the producer thread
+    with profile_phase("streaming_pipeline"):
+        run_streaming_pipeline(converter, deployer, queue_size=args.queue_size, workers=args.workers)
+    deployer.verify()
+    if not deployer.train():
+        print("⛔ Streaming deployment finished but some flows failed to train")
+        sys.exit(1)
+    print("🎉 Agent trained and ready to serve traffic")
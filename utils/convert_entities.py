@@ -65,4 +65,6 @@ def convert_entities(client, agent_path, entities_path):
             )
             print(f"✅ Created entity: {response.display_name} (ID: {response.name.split('/')[-1]})")
         except Exception as e:
-            print(f"❌ Failed to create {entity_id}: {e}")
\ No newline at end of file
+            print(f"❌ Failed to create {entity_id}: {e}")
+
+    return [entity_data['display_name'] for entity_data in entity_map.values()]
\ No newline at end of file
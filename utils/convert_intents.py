@@ -1,8 +1,13 @@
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import dialogflowcx_v3beta1 as dialogflowcx
 from google.api_core.exceptions import AlreadyExists
+from utils.languages import detect_languages, split_language_file
+from utils.model import Intent, Parameter
+from utils.param_index import build_parameter_index, correct_name, cx_entity_type
+from utils.profiling import profile_phase
 
 # System intents that shouldn't be deleted or recreated
 SYSTEM_INTENTS = [
@@ -66,107 +71,146 @@ def check_entity_exists(entity_client, agent_path, entity_name):
         print(f"⚠️ Error checking entity {entity_name}: {str(e)}")
         return False
 
+def _add_language(intents_client, intent_name, cx_intent):
+    """Add one language's training phrases to an existing intent"""
+    display_name = cx_intent.display_name
+    language_code = cx_intent.language_code
+    try:
+        intents_client.update_intent(request={
+            # Only the phrases are sent, parameters stay as the default language created them
+            "intent": Intent(display_name, language_code, cx_intent.training_phrases).to_proto(dialogflowcx, name=intent_name),
+            "language_code": language_code,
+            "update_mask": {"paths": ["training_phrases"]}
+        })
+        print(f"✅ Added [{language_code}] phrases: {display_name}")
+    except Exception as e:
+        print(f"❌ Failed to add [{language_code}] phrases to {display_name}: {e}")
+
 def convert_intents(intents_client, agent_path, intents_path, agent_id, entity_client):
-    """Convert Dialogflow ES intents to CX format with proper parameter handling"""
-    # First collect all training phrases from _usersays_ files
-    training_data = {}
+    """Convert Dialogflow ES intents to CX format with proper parameter handling.
+
+    Returns the deployed intents per language, {lang: {display_name: Intent}},
+    with parameters bound to '@entity' names as verify_deployment expects.
+    """
+    languages = detect_languages(os.path.dirname(os.path.normpath(intents_path)))
+    default_language = languages[0]
+    print(f"🌐 Languages: {', '.join(languages)} (default: {default_language})")
+
+    # Parameter entities come from the ES intent definitions, never from guesses
+    print("\n🔍 Indexing parameter entities...")
+    parameter_index = build_parameter_index(intents_path)
+
+    # Get the actual entity IDs from the agent once, not per intent
+    project_id = agent_path.split('/')[1]
+    location = agent_path.split('/')[3]
+    entity_map = {
+        entity.display_name: f"projects/{project_id}/locations/{location}/agents/{agent_id}/entityTypes/{entity.name.split('/')[-1]}"
+        for entity in entity_client.list_entity_types(parent=agent_path)
+    }
+
+    # First collect all training phrases from _usersays_ files, per language.
+    # They go straight into the compact model so the raw ES dicts can be freed.
+    training_data = {lang: {} for lang in languages}
     
     # Load all user says files first
     print("\n🔍 Loading training phrases from user says files...")
-    for file in os.listdir(intents_path):
-        if "_usersays_" in file:
-            try:
-                base_name = file.split("_usersays_")[0]
-                file_path = os.path.join(intents_path, file)
+    with profile_phase("load_usersays"):
+        for file in os.listdir(intents_path):
+            split = split_language_file(file, "usersays")
+            if split:
+                try:
+                    base_name, lang = split
+                    file_path = os.path.join(intents_path, file)
                 
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        if base_name not in training_data:
-                            training_data[base_name] = []
-                        training_data[base_name].extend(data)
-            except Exception as e:
-                print(f"⚠️ Error loading {file}: {e}")
+                    with open(file_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                        if isinstance(data, list):
+                            shard = training_data.setdefault(lang, {})
+                            shard.setdefault(base_name, Intent(base_name, lang)).add_es_phrases(data)
+                except Exception as e:
+                    print(f"⚠️ Error loading {file}: {e}")
 
-    # Process main intent files
+    # Process main intent files in the default language
     print("\n🔄 Converting intents...")
-    for file in os.listdir(intents_path):
-        if "_usersays_" in file or not file.endswith(".json"):
-            continue
+    created = {}
+    expected = {lang: {} for lang in languages}
+    with profile_phase("deploy_intents"):
+        for file in os.listdir(intents_path):
+            if "_usersays_" in file or not file.endswith(".json"):
+                continue
 
-        display_name = os.path.splitext(file)[0]
-        
-        # Skip system intents
-        if display_name in SYSTEM_INTENTS:
-            print(f"⏩ Skipping system intent: {display_name}")
-            continue
+            display_name = os.path.splitext(file)[0]
         
-        # Get phrases from collected data
-        phrases = training_data.get(display_name, [])
+            # Skip system intents
+            if display_name in SYSTEM_INTENTS:
+                print(f"⏩ Skipping system intent: {display_name}")
+                continue
         
-        # Prepare training phrases
-        training_phrases = []
-        parameters = set()
-        
-        for phrase in phrases:
-            parts = []
-            for part in phrase.get("data", []):
-                text = part.get("text", "").strip()
-                alias = part.get("alias", "").strip()
-                
-                if text:
-                    part_data = {"text": text}
-                    if alias:
-                        param_id = alias.lower().replace(" ", "_")
-                        part_data["parameter_id"] = param_id
-                        parameters.add(param_id)
-                    parts.append(part_data)
-            
-            if parts:
-                training_phrases.append({
-                    "parts": parts,
-                    "repeat_count": 1
-                })
+            # Get phrases from collected data
+            cx_intent = training_data[default_language].get(display_name)
 
-        if not training_phrases:
-            print(f"⚠️ No valid phrases for {display_name}")
-            continue
+            if not cx_intent or not cx_intent.training_phrases:
+                print(f"⚠️ No valid phrases for {display_name}")
+                continue
 
-        # Create intent with proper entity references
-        intent = {
-            "display_name": display_name,
-            "training_phrases": training_phrases
-        }
+            # Parameters are shared by every language of the intent
+            parameters = cx_intent.parameter_ids()
+            for lang in languages[1:]:
+                if display_name in training_data[lang]:
+                    parameters |= training_data[lang][display_name].parameter_ids()
 
-        project_id = agent_path.split('/')[1]
-        location = agent_path.split('/')[3]
-        
-        if parameters:
-            # Get the actual entity IDs from the agent
-            entity_id_map = {}
-            for entity in entity_client.list_entity_types(parent=agent_path):
-                entity_id_map[entity.display_name] = entity.name.split('/')[-1]
-            
-            intent["parameters"] = []
-            for param in parameters:
-                if param in entity_id_map:
-                    intent["parameters"].append({
-                        "id": param,
-                        "entity_type": f"projects/{project_id}/locations/{location}/agents/{agent_id}/entityTypes/{entity_id_map[param]}",
-                        "is_list": False,
-                        "redact": False
-                    })
+            bound_entities = []
+            for param in sorted(parameters):
+                entity = parameter_index.resolve(display_name, param)
+                entity_type = cx_entity_type(entity, entity_map)
+                if entity_type:
+                    cx_intent.parameters.append(Parameter(param, entity_type))
+                    bound_entities.append(Parameter(param, entity))
                 else:
-                    print(f"⛔ Parameter '{param}' references missing entity")
-                    return  # Skip this intent entirely if any parameter is invalid
-            
-        try:
-            response = intents_client.create_intent(
-                parent=agent_path,
-                intent=intent
-            )
-            print(f"✅ Created intent: {display_name}")
-        except AlreadyExists:
-            print(f"⏩ Intent already exists: {display_name}")
-        except Exception as e:
-            print(f"❌ Failed to create {display_name}: {e}")
\ No newline at end of file
+                    print(f"⚠️ Parameter '{param}' references missing entity {entity}, keeping it as text")
+
+            # Unresolved parameters become plain text in every language
+            bound = {p.id for p in cx_intent.parameters}
+            for lang in languages:
+                if display_name in training_data[lang]:
+                    training_data[lang][display_name].unbind_parameters(bound)
+            cx_intent.display_name = correct_name(display_name)
+            intent_proto = cx_intent.to_proto(dialogflowcx)
+
+            # Parameters are shared, every language expects the same bindings once deployed
+            for lang in languages:
+                shard_intent = training_data[lang].get(display_name)
+                if shard_intent and shard_intent.training_phrases:
+                    shard_intent.display_name = cx_intent.display_name
+                    shard_intent.parameters = bound_entities
+                    expected[lang][cx_intent.display_name] = shard_intent
+
+            try:
+                response = intents_client.create_intent(request={
+                    "parent": agent_path,
+                    "intent": intent_proto,
+                    "language_code": default_language
+                })
+                created[display_name] = response.name
+                print(f"✅ Created intent: {display_name}")
+            except AlreadyExists:
+                print(f"⏩ Intent already exists: {display_name}")
+            except Exception as e:
+                print(f"❌ Failed to create {display_name}: {e}")
+
+    # Other languages are independent shards on top of the created intents
+    other_languages = [lang for lang in languages if lang != default_language]
+    if other_languages and created:
+        print(f"\n🌐 Adding training phrases for: {', '.join(other_languages)}")
+
+        def add_shard(lang):
+            for display_name, intent_name in created.items():
+                shard_intent = training_data[lang].get(display_name)
+                if shard_intent and shard_intent.training_phrases:
+                    _add_language(intents_client, intent_name, shard_intent)
+
+        with profile_phase("deploy_languages"):
+            with ThreadPoolExecutor(max_workers=len(other_languages)) as pool:
+                list(pool.map(add_shard, other_languages))
+
+    return expected
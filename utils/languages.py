@@ -0,0 +1,40 @@
+import json
+import os
+import re
+
+LANGUAGE_FILE_PATTERN = re.compile(r"_(?:entries|usersays)_([A-Za-z]{2,3}(?:-[A-Za-z0-9]+)*)\.json$")
+
+def load_agent_languages(export_dir):
+    """Return (default_language, supported_languages) from the ES agent.json, if present"""
+    agent_file = os.path.join(export_dir, "agent.json")
+    if not os.path.exists(agent_file):
+        return None, []
+    with open(agent_file, "r", encoding="utf-8-sig") as f:
+        agent = json.load(f)
+    return agent.get("language"), list(agent.get("supportedLanguages", []))
+
+def detect_languages(export_dir):
+    """List every language in an extracted ES export, default language first"""
+    found = set()
+    for sub_dir in ("entities", "intents"):
+        path = os.path.join(export_dir, sub_dir)
+        if not os.path.isdir(path):
+            continue
+        for file in os.listdir(path):
+            match = LANGUAGE_FILE_PATTERN.search(file)
+            if match:
+                found.add(match.group(1))
+
+    default_language, supported = load_agent_languages(export_dir)
+    ordered = [lang for lang in [default_language] + supported if lang]
+    ordered += sorted(found - set(ordered))
+    # Drop languages declared in agent.json that have no data at all
+    languages = [lang for lang in dict.fromkeys(ordered) if lang in found or lang == default_language]
+    return languages or ["id"]
+
+def split_language_file(file_name, marker):
+    """Split 'name_<marker>_<lang>.json' into (name, lang), or None when it does not match"""
+    if not file_name.endswith(".json") or f"_{marker}_" not in file_name:
+        return None
+    base_name, lang = file_name[:-len(".json")].rsplit(f"_{marker}_", 1)
+    return base_name, lang
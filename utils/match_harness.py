@@ -0,0 +1,166 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def phrase_text(training_phrase):
+    """Rebuild the user utterance from a training phrase's parts"""
+    return " ".join(p.text for p in training_phrase.parts)
+
+def build_cases(intents, holdout=None, seed=0):
+    """Return [(text, expected intent)], all phrases or a per-intent holdout sample.
+
+    With holdout set, the sampled phrases are also removed from the intents
+    so they can be redeployed without them.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for intent in intents:
+        phrases = intent.training_phrases
+        if holdout:
+            count = max(1, int(len(phrases) * holdout)) if len(phrases) > 1 else 0
+            picked = set(rng.sample(range(len(phrases)), count))
+            cases += [(phrase_text(phrases[i]), intent.display_name) for i in sorted(picked)]
+            intent.training_phrases = [p for i, p in enumerate(phrases) if i not in picked]
+        else:
+            cases += [(phrase_text(p), intent.display_name) for p in phrases]
+    rng.shuffle(cases)
+    return cases
+
+def save_cases(path, cases, language_code):
+    """Write held-out cases so a later replay uses exactly the phrases removed from training"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "language_code": language_code,
+            "cases": [{"text": text, "intent": intent} for text, intent in cases]
+        }, f, indent=2, ensure_ascii=False)
+
+def load_cases(path):
+    """Read cases written by save_cases, return (language_code, [(text, expected intent)])"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data["language_code"], [(case["text"], case["intent"]) for case in data["cases"]]
+
+class LocalBackend:
+    """Offline stand-in for CX matching: best token overlap with any training phrase"""
+    def __init__(self, intents, latency=0.0):
+        self.latency = latency
+        self.phrases = []
+        self.index = defaultdict(list)
+        for intent in intents:
+            for training_phrase in intent.training_phrases:
+                tokens = frozenset(TOKEN_PATTERN.findall(phrase_text(training_phrase).lower()))
+                phrase_id = len(self.phrases)
+                self.phrases.append((intent.display_name, tokens))
+                for token in tokens:
+                    self.index[token].append(phrase_id)
+
+    def match(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        tokens = set(TOKEN_PATTERN.findall(text.lower()))
+        overlap = Counter(phrase_id for token in tokens for phrase_id in self.index.get(token, ()))
+        best, best_score = None, 0.0
+        for phrase_id, shared in overlap.items():
+            intent_name, phrase_tokens = self.phrases[phrase_id]
+            score = shared / len(tokens | phrase_tokens)
+            if score > best_score:
+                best, best_score = intent_name, score
+        return best
+
+class CXSessionsBackend:
+    """Matches text against a deployed agent with SessionsClient match_intent or detect_intent"""
+    def __init__(self, sessions_client, agent_path, language_code, method="match"):
+        self.sessions_client = sessions_client
+        self.agent_path = agent_path
+        self.language_code = language_code
+        self.method = method
+
+    def match(self, text):
+        request = {
+            "session": f"{self.agent_path}/sessions/{uuid.uuid4()}",
+            "query_input": {"text": {"text": text}, "language_code": self.language_code}
+        }
+        if self.method == "detect":
+            match = self.sessions_client.detect_intent(request=request).query_result.match
+            return match.intent.display_name or None
+        matches = self.sessions_client.match_intent(request=request).matches
+        if not matches:
+            return None
+        return matches[0].intent.display_name or None
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+def run_load(backend, cases, concurrency=8, qps=None):
+    """Fire every case at the backend, paced to qps when given, and collect outcomes"""
+    results = [None] * len(cases)
+    start = time.perf_counter()
+    lock = threading.Lock()
+    next_slot = [start]
+
+    def fire(i):
+        if qps:
+            # Hand out evenly spaced send times so the pool keeps to the target rate
+            with lock:
+                slot = next_slot[0]
+                next_slot[0] += 1.0 / qps
+            wait = slot - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        text, expected = cases[i]
+        sent = time.perf_counter()
+        try:
+            predicted, error = backend.match(text), None
+        except Exception as e:
+            predicted, error = None, str(e)
+        results[i] = (expected, predicted, time.perf_counter() - sent, error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(fire, range(len(cases))))
+
+    return results, time.perf_counter() - start
+
+def summarize(results, elapsed, top_confusions=10):
+    """Per-intent top-1 accuracy, most common confusions and latency percentiles"""
+    per_intent = defaultdict(lambda: [0, 0])
+    confusions = Counter()
+    errors = Counter()
+    for expected, predicted, _, error in results:
+        per_intent[expected][1] += 1
+        if error:
+            errors[error] += 1
+        elif predicted == expected:
+            per_intent[expected][0] += 1
+        else:
+            confusions[(expected, predicted or "<no match>")] += 1
+
+    latencies = sorted(r[2] * 1000 for r in results if not r[3])
+    correct = sum(c for c, _ in per_intent.values())
+    return {
+        "requests": len(results),
+        "errors": sum(errors.values()),
+        "achieved_qps": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "accuracy": round(correct / len(results), 4) if results else 0.0,
+        "per_intent": {
+            name: {"correct": c, "total": t, "accuracy": round(c / t, 4)}
+            for name, (c, t) in sorted(per_intent.items())
+        },
+        "confusions": [
+            {"expected": expected, "predicted": predicted, "count": count}
+            for (expected, predicted), count in confusions.most_common(top_confusions)
+        ],
+        "latency_ms": {f"p{p}": round(percentile(latencies, p), 2) for p in (50, 90, 95, 99)},
+        "error_samples": [e for e, _ in errors.most_common(3)]
+    }
@@ -0,0 +1,234 @@
+from sys import intern
+
+# ES JSON is read once into these classes and turned into CX protos once.
+# Parameter IDs and entity names are interned since they repeat on every part.
+
+def param_id_from_alias(alias):
+    """Normalise an ES alias into the CX parameter ID"""
+    return intern(alias.strip().lower().replace(" ", "_"))
+
+class Part:
+    __slots__ = ("text", "parameter_id")
+
+    def __init__(self, text, parameter_id=None):
+        self.text = text
+        self.parameter_id = parameter_id
+
+    def to_dict(self):
+        if self.parameter_id:
+            return {"text": self.text, "parameter_id": self.parameter_id}
+        return {"text": self.text}
+
+class TrainingPhrase:
+    __slots__ = ("parts", "repeat_count")
+
+    def __init__(self, parts, repeat_count=1):
+        self.parts = tuple(parts)
+        self.repeat_count = repeat_count
+
+    @classmethod
+    def from_es(cls, phrase):
+        """Build from one ES usersays entry, or None when it has no text"""
+        parts = []
+        for part in phrase.get("data", []):
+            text = part.get("text", "").strip()
+            if not text:
+                continue
+            alias = part.get("alias", "").strip()
+            parts.append(Part(text, param_id_from_alias(alias) if alias else None))
+        return cls(parts) if parts else None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            (Part(p["text"], intern(p["parameter_id"]) if p.get("parameter_id") else None) for p in data["parts"]),
+            data.get("repeat_count", 1)
+        )
+
+    def to_dict(self):
+        return {"parts": [p.to_dict() for p in self.parts], "repeat_count": self.repeat_count}
+
+    def to_proto(self, df):
+        return df.Intent.TrainingPhrase(
+            parts=[df.Intent.TrainingPhrase.Part(text=p.text, parameter_id=p.parameter_id) for p in self.parts],
+            repeat_count=self.repeat_count
+        )
+
+class Parameter:
+    __slots__ = ("id", "entity_type", "is_list", "redact")
+
+    def __init__(self, id, entity_type="@sys.any", is_list=False, redact=False):
+        self.id = intern(id)
+        self.entity_type = intern(entity_type)
+        self.is_list = is_list
+        self.redact = redact
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data.get("entity_type", "@sys.any"), data.get("is_list", False), data.get("redact", False))
+
+    def to_dict(self):
+        return {"id": self.id, "entity_type": self.entity_type, "is_list": self.is_list, "redact": self.redact}
+
+    def to_proto(self, df):
+        return df.Intent.Parameter(id=self.id, entity_type=self.entity_type, is_list=self.is_list, redact=self.redact)
+
+class Intent:
+    __slots__ = ("display_name", "language_code", "training_phrases", "parameters")
+
+    def __init__(self, display_name, language_code=None, training_phrases=None, parameters=None):
+        self.display_name = display_name
+        self.language_code = language_code
+        self.training_phrases = training_phrases or []
+        self.parameters = parameters or []
+
+    @classmethod
+    def from_es(cls, display_name, usersays, language_code=None, resolve=None):
+        """Build from the ES usersays list, resolve maps a parameter ID to its entity (default @sys.any)"""
+        intent = cls(display_name, language_code)
+        intent.add_es_phrases(usersays)
+        intent.parameters = [
+            Parameter(param_id, resolve(param_id)) if resolve else Parameter(param_id)
+            for param_id in sorted(intent.parameter_ids())
+        ]
+        return intent
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["display_name"],
+            data.get("language_code"),
+            [TrainingPhrase.from_dict(p) for p in data.get("training_phrases", [])],
+            [Parameter.from_dict(p) for p in data.get("parameters", [])]
+        )
+
+    @classmethod
+    def from_proto(cls, intent, language_code=None):
+        """Build from a deployed CX Intent proto, entity types stay as resource names"""
+        return cls(
+            intent.display_name,
+            language_code,
+            [
+                TrainingPhrase(
+                    (Part(p.text, intern(p.parameter_id) if p.parameter_id else None) for p in phrase.parts),
+                    phrase.repeat_count
+                )
+                for phrase in intent.training_phrases
+            ],
+            [Parameter(p.id, p.entity_type, p.is_list, p.redact) for p in intent.parameters]
+        )
+
+    def add_es_phrases(self, usersays):
+        for phrase in usersays:
+            training_phrase = TrainingPhrase.from_es(phrase)
+            if training_phrase:
+                self.training_phrases.append(training_phrase)
+
+    def parameter_ids(self):
+        """Parameter IDs referenced by any training phrase part"""
+        return {p.parameter_id for phrase in self.training_phrases for p in phrase.parts if p.parameter_id}
+
+    def unbind_parameters(self, keep_ids):
+        """Turn parts bound to parameters outside keep_ids into plain text, return the dropped IDs"""
+        dropped = set()
+        for phrase in self.training_phrases:
+            for p in phrase.parts:
+                if p.parameter_id and p.parameter_id not in keep_ids:
+                    dropped.add(p.parameter_id)
+                    p.parameter_id = None
+        return dropped
+
+    def merge_parameters(self, others):
+        """Add the parameters other languages of this intent use, CX shares them across languages"""
+        known = {p.id for p in self.parameters}
+        for other in others:
+            for param in other.parameters:
+                if param.id not in known:
+                    known.add(param.id)
+                    self.parameters.append(param)
+        self.parameters.sort(key=lambda p: p.id)
+
+    def to_dict(self):
+        data = {
+            "display_name": self.display_name,
+            "language_code": self.language_code,
+            "training_phrases": [p.to_dict() for p in self.training_phrases]
+        }
+        if self.parameters:
+            data["parameters"] = [p.to_dict() for p in self.parameters]
+        return data
+
+    def to_proto(self, df, name=None):
+        intent = df.Intent(
+            display_name=self.display_name,
+            training_phrases=[p.to_proto(df) for p in self.training_phrases],
+            parameters=[p.to_proto(df) for p in self.parameters]
+        )
+        if name:
+            intent.name = name
+        return intent
+
+class EntityEntry:
+    __slots__ = ("value", "synonyms")
+
+    def __init__(self, value, synonyms):
+        self.value = value
+        self.synonyms = tuple(synonyms)
+
+    def to_dict(self):
+        return {"value": self.value, "synonyms": list(self.synonyms)}
+
+class EntityType:
+    __slots__ = ("display_name", "language_code", "kind", "entities")
+
+    def __init__(self, display_name, language_code=None, kind="KIND_MAP", entities=None):
+        self.display_name = intern(display_name)
+        self.language_code = language_code
+        self.kind = kind
+        self.entities = entities or []
+
+    @classmethod
+    def from_es(cls, name, entries, language_code=None):
+        """Build from an ES *_entries_<lang>.json list"""
+        return cls(name.lower(), language_code, entities=[
+            EntityEntry(entry["value"], entry.get("synonyms", []))
+            for entry in entries
+            if isinstance(entry, dict) and "value" in entry
+        ])
+
+    @classmethod
+    def from_proto(cls, entity_type, language_code=None):
+        """Build from a deployed CX EntityType proto"""
+        return cls(
+            entity_type.display_name,
+            language_code,
+            entity_type.kind.name,
+            [EntityEntry(e.value, e.synonyms) for e in entity_type.entities]
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["display_name"],
+            data.get("language_code"),
+            data.get("kind", "KIND_MAP"),
+            [EntityEntry(e["value"], e.get("synonyms", [])) for e in data.get("entities", [])]
+        )
+
+    def to_dict(self):
+        return {
+            "display_name": self.display_name,
+            "language_code": self.language_code,
+            "kind": self.kind,
+            "entities": [e.to_dict() for e in self.entities]
+        }
+
+    def to_proto(self, df, name=None):
+        entity_type = df.EntityType(
+            display_name=self.display_name,
+            kind=self.kind,
+            entities=[df.EntityType.Entity(value=e.value, synonyms=list(e.synonyms)) for e in self.entities]
+        )
+        if name:
+            entity_type.name = name
+        return entity_type
@@ -0,0 +1,91 @@
+import json
+import os
+from sys import intern
+from fix_names_config import NAME_CORRECTIONS
+from utils.languages import split_language_file
+from utils.model import param_id_from_alias
+
+SYS_ANY = "@sys.any"
+SYSTEM_ENTITY_PATH = "projects/-/locations/-/agents/-/entityTypes/{}"
+
+def correct_name(name):
+    """Apply fix_names_config.NAME_CORRECTIONS to an entity or intent name"""
+    return NAME_CORRECTIONS.get(name, name)
+
+def entity_from_data_type(data_type):
+    """'@jenis_info_klano' -> '@jenis_info_kiano', '@sys.number' unchanged, None if not an entity"""
+    if not data_type or not data_type.startswith("@"):
+        return None
+    name = data_type[1:]
+    if name.startswith("sys."):
+        return intern(data_type)
+    # Custom entity display names are lowercased by the converter
+    return intern(f"@{correct_name(name).lower()}")
+
+def is_system_entity(entity):
+    """True for '@sys.*' entities, which CX provides without deploying them"""
+    return entity.startswith("@sys.")
+
+def cx_entity_type(entity, entity_map):
+    """CX entity type resource for a resolved entity, None when the custom entity is not deployed"""
+    if is_system_entity(entity):
+        return SYSTEM_ENTITY_PATH.format(entity[1:])
+    return entity_map.get(entity[1:])
+
+class ParameterIndex:
+    """Maps (intent, parameter ID) to its entity, '@name' for custom and '@sys.*' for system ones"""
+    def __init__(self):
+        self.by_intent = {}
+        self.by_alias = {}
+
+    def _add(self, intent_name, alias, entity):
+        param_id = param_id_from_alias(alias)
+        self.by_intent.setdefault(intent_name, {}).setdefault(param_id, entity)
+        self.by_alias.setdefault(param_id, entity)
+
+    def add_intent(self, intent_name, intent_data):
+        """Index the responses[].parameters[].dataType of an ES intent file"""
+        for response in intent_data.get("responses", []):
+            for param in response.get("parameters", []):
+                entity = entity_from_data_type(param.get("dataType"))
+                if entity and param.get("name"):
+                    self._add(intent_name, param["name"], entity)
+
+    def add_usersays(self, intent_name, usersays):
+        """Fill gaps from the meta annotations of an ES usersays list"""
+        for phrase in usersays:
+            for part in phrase.get("data", []):
+                entity = entity_from_data_type(part.get("meta"))
+                if entity and part.get("alias"):
+                    self._add(intent_name, part["alias"], entity)
+
+    def resolve(self, intent_name, param_id):
+        """Entity for a parameter: the intent's own definition, then any intent's, then @sys.any"""
+        return self.by_intent.get(intent_name, {}).get(param_id) or self.by_alias.get(param_id) or SYS_ANY
+
+def build_parameter_index(intents_path):
+    """Index every ES intent's dataType, then every usersays meta annotation, before anything resolves"""
+    index = ParameterIndex()
+    files = sorted(os.listdir(intents_path))
+    for file in files:
+        if "_usersays_" in file or not file.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(intents_path, file), "r", encoding="utf-8-sig") as f:
+                index.add_intent(os.path.splitext(file)[0], json.load(f))
+        except Exception as e:
+            print(f"⚠️ Error indexing {file}: {e}")
+
+    # Annotations only fill gaps, so results don't depend on file order or language shard
+    for file in files:
+        split = split_language_file(file, "usersays")
+        if not split:
+            continue
+        try:
+            with open(os.path.join(intents_path, file), "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                index.add_usersays(split[0], data)
+        except Exception as e:
+            print(f"⚠️ Error indexing {file}: {e}")
+    return index
@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.model import EntityType
+from utils.param_index import is_system_entity
+
+_DONE = object()
+
+def _produce(converter, work_queue, write_output, errors):
+    """Convert every language shard into the queue, entities before intents"""
+    try:
+        for lang in converter.languages:
+            for cx_entity in converter.iter_entities(lang):
+                if write_output:
+                    converter.save_entity(cx_entity)
+                work_queue.put(cx_entity)
+        # All languages of an intent are converted together so the default-language
+        # intent is deployed with every language's parameters
+        for group in converter.iter_intent_groups():
+            if write_output:
+                for cx_intent in group:
+                    converter.save_intent(cx_intent)
+            if group[0].language_code == converter.default_language:
+                group[0].merge_parameters(group[1:])
+            for cx_intent in group:
+                work_queue.put(cx_intent)
+        if write_output:
+            converter.write_manifest()
+    except Exception as e:
+        # Raised again in the main thread so a partial run is never reported as complete
+        errors.append(e)
+    finally:
+        work_queue.put(_DONE)
+
+def _dependencies(item, default_language):
+    """Return (key, wanted dependency keys) for a converted resource"""
+    if isinstance(item, EntityType):
+        if item.language_code == default_language:
+            return ("entity", item.display_name), set()
+        return ("entity", item.display_name, item.language_code), {("entity", item.display_name)}
+
+    if item.language_code == default_language:
+        return ("intent", item.display_name), {
+            ("entity", p.entity_type[1:]) for p in item.parameters if not is_system_entity(p.entity_type)
+        }
+    return ("intent", item.display_name, item.language_code), {("intent", item.display_name)}
+
+def run_streaming_pipeline(converter, deployer, queue_size=64, workers=8, write_output=True):
+    """Deploy converted resources while conversion is still running.
+
+    Entities are deployed as soon as they are converted. An intent is held
+    back only until the entity types it references have been deployed, and
+    extra languages wait for their default-language resource to exist.
+    """
+    print("🚀 Starting streaming conversion and deployment...")
+    default_language = converter.default_language
+    print(f"🌐 Languages: {', '.join(converter.languages)} (default: {default_language})")
+
+    work_queue = queue.Queue(maxsize=queue_size)
+    # Caps resources taken off the queue but not yet deployed, so conversion blocks
+    # once it is queue_size ahead instead of piling work up in the executor
+    slots = threading.Semaphore(queue_size)
+    entity_map = {}
+    parameter_ids = {}
+    seen, settled = set(), set()
+    waiting = []
+    stats = {"entities": 0, "intents": 0, "failed": 0}
+    lock = threading.Condition()
+    in_flight = [0]
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def deploy(item):
+        if isinstance(item, EntityType):
+            name = deployer.deploy_entity_type(item, item.language_code)
+            if name and item.language_code == default_language:
+                entity_map[item.display_name] = name
+            return name
+        if item.language_code != default_language:
+            # Parameters are shared, other languages only add their training phrases
+            if item.display_name not in parameter_ids:
+                print(f"⚠️ Intent {item.display_name} was not deployed, skipping [{item.language_code}] phrases")
+                return None
+            return deployer.add_intent_language(item, parameter_ids[item.display_name], item.language_code)
+        name = deployer.deploy_cx_intent(item, entity_map, item.language_code)
+        if name:
+            parameter_ids[item.display_name] = {p.id for p in item.parameters}
+        return name
+
+    def on_done(key, item, future):
+        try:
+            ok = future.result() is not None
+        except Exception as e:
+            print(f"❌ Failed to deploy {item.display_name}: {e}")
+            ok = False
+        with lock:
+            # Failed resources settle too, dependants then deploy without them
+            settled.add(key)
+            stats["entities" if isinstance(item, EntityType) else "intents"] += ok
+            stats["failed"] += not ok
+            ready = [w for w in waiting if w[0] <= settled]
+            waiting[:] = [w for w in waiting if not w[0] <= settled]
+            in_flight[0] -= 1
+            lock.notify_all()
+        slots.release()
+        for _, ready_key, ready_item in ready:
+            submit(ready_key, ready_item)
+
+    def submit(key, item):
+        future = pool.submit(deploy, item)
+        future.add_done_callback(lambda f: on_done(key, item, f))
+
+    # One list call per resource kind up front instead of one per deployed resource
+    deployer.load_existing()
+
+    start = time.perf_counter()
+    producer_errors = []
+    producer = threading.Thread(target=_produce, args=(converter, work_queue, write_output, producer_errors), daemon=True)
+    producer.start()
+
+    while True:
+        slots.acquire()
+        item = work_queue.get()
+        if item is _DONE:
+            slots.release()
+            break
+        key, wanted = _dependencies(item, default_language)
+        with lock:
+            seen.add(key)
+            # Entities always arrive before intents, so unseen dependencies never will
+            deps = wanted & seen
+            in_flight[0] += 1
+            if not deps <= settled:
+                waiting.append((deps, key, item))
+                continue
+        submit(key, item)
+
+    producer.join()
+    with lock:
+        while in_flight[0]:
+            lock.wait()
+    pool.shutdown()
+    if producer_errors:
+        print(f"❌ Conversion failed, deployment is incomplete: {producer_errors[0]}")
+        raise producer_errors[0]
+
+    elapsed = time.perf_counter() - start
+    print(f"\n🎉 Streaming deployment completed in {elapsed:.1f}s: "
+          f"{stats['entities']} entities, {stats['intents']} intents, {stats['failed']} failed")
+    return stats
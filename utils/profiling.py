@@ -0,0 +1,116 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# Set ES2CX_PROFILE_DIR to turn profiling on, ES2CX_PROFILE picks "cpu", "memory" or both
+PROFILE_DIR_ENV = "ES2CX_PROFILE_DIR"
+PROFILE_MODE_ENV = "ES2CX_PROFILE"
+TOP_ENTRIES = 30
+# Seconds between traced-memory samples while a phase runs
+SAMPLE_INTERVAL = 0.05
+
+_active = []
+_counts = {}
+
+def _phase_file_stem(profile_dir, name):
+    """Unique per-process file stem, repeated phases get a numeric suffix"""
+    key = (os.getpid(), name)
+    _counts[key] = _counts.get(key, 0) + 1
+    suffix = f"_{_counts[key]}" if _counts[key] > 1 else ""
+    return profile_dir / f"{name}{suffix}"
+
+class _PeakSampler(threading.Thread):
+    """Keeps a snapshot of the largest traced memory seen while a phase runs"""
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.snapshot = None
+        # Below any real size, so the first sample always keeps a snapshot
+        self.size = -1
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.size:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.size = current
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+@contextmanager
+def profile_phase(name):
+    """Profile one pipeline phase when ES2CX_PROFILE_DIR is set, otherwise do nothing.
+
+    Writes <name>.prof and <name>_cpu.txt (top functions by cumulative time)
+    and <name>_memory.txt (peak traced memory and the top allocation sites of
+    the largest sampled snapshot, taken every SAMPLE_INTERVAL seconds).
+    Nested phases run unprofiled inside the outer one, and CPU time is only
+    collected for the calling thread.
+    """
+    profile_dir = os.environ.get(PROFILE_DIR_ENV)
+    if not profile_dir or _active:
+        yield
+        return
+
+    modes = os.environ.get(PROFILE_MODE_ENV, "cpu,memory").split(",")
+    profile_dir = Path(profile_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stem = _phase_file_stem(profile_dir, name)
+
+    profiler = cProfile.Profile() if "cpu" in modes else None
+    trace_memory = "memory" in modes and not tracemalloc.is_tracing()
+    sampler = None
+    if trace_memory:
+        tracemalloc.start(10)
+        sampler = _PeakSampler()
+        sampler.start()
+
+    _active.append(name)
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        _active.pop()
+
+        peak = None
+        if trace_memory:
+            sampler.stop()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(f"{stem}_memory.txt", 'w', encoding='utf-8') as f:
+                f.write(f"Phase {name}: peak {peak / (1024 * 1024):.2f} MB, {elapsed:.3f}s\n")
+                # Spikes shorter than the sampling interval can be missed, compare the two sizes
+                f.write(f"Top {TOP_ENTRIES} allocation sites at the largest sample "
+                        f"({sampler.size / (1024 * 1024):.2f} MB held):\n")
+                for stat in sampler.snapshot.statistics("lineno")[:TOP_ENTRIES]:
+                    f.write(f"{stat}\n")
+
+        if profiler:
+            profiler.dump_stats(f"{stem}.prof")
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+            with open(f"{stem}_cpu.txt", 'w', encoding='utf-8') as f:
+                f.write(out.getvalue())
+
+        with open(profile_dir / "phases.txt", 'a', encoding='utf-8') as f:
+            peak_text = f"{peak / (1024 * 1024):.2f} MB peak" if peak is not None else "memory not traced"
+            f.write(f"{stem.name}\t{elapsed:.3f}s\t{peak_text}\n")
+        print(f"📊 Profiled {name}: {elapsed:.2f}s → {stem}")
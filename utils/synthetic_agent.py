@@ -0,0 +1,162 @@
+import argparse
+import json
+import random
+import uuid
+import zipfile
+
+WORDS = [
+    "saya", "mau", "tanya", "info", "tentang", "rumah", "harga", "berapa",
+    "lokasi", "dimana", "promo", "cicilan", "unit", "tipe", "ada", "masih",
+    "tolong", "jelaskan", "kapan", "bisa", "survei", "proyek", "dekat", "kantor"
+]
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _dump(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def generate_es_agent(zip_path, intents=50, phrases_per_intent=20, annotated_parts=1,
+                      entity_types=5, entries_per_entity=20, languages=("id",), seed=0):
+    """Write a deterministic Dialogflow ES export ZIP and return its phrase/entry counts"""
+    rng = random.Random(seed)
+    languages = list(languages)
+    entity_names = [f"entity_{i:04d}" for i in range(entity_types)]
+    entity_values = {
+        name: [f"{name}_value_{j:04d}" for j in range(entries_per_entity)]
+        for name in entity_names
+    }
+    # Annotations need at least one entity type to point at
+    annotated_parts = annotated_parts if entity_names else 0
+
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("package.json", _dump({"version": "1.0.0"}))
+        zf.writestr("agent.json", _dump({
+            "description": "Synthetic benchmark agent",
+            "language": languages[0],
+            "supportedLanguages": languages[1:],
+            "defaultTimezone": "Asia/Jakarta",
+            "enableOnePlatformApi": True
+        }))
+
+        for name in entity_names:
+            zf.writestr(f"entities/{name}.json", _dump({
+                "id": _uuid(rng),
+                "name": name,
+                "isOverridable": True,
+                "isEnum": False,
+                "isRegexp": False,
+                "automatedExpansion": False,
+                "allowFuzzyExtraction": False
+            }))
+            for lang in languages:
+                zf.writestr(f"entities/{name}_entries_{lang}.json", _dump([
+                    {"value": value, "synonyms": [value, f"{value} {lang}"]}
+                    for value in entity_values[name]
+                ]))
+
+        for i in range(intents):
+            intent_name = f"intent_{i:05d}"
+            intent_entities = rng.sample(entity_names, min(annotated_parts, len(entity_names)))
+            zf.writestr(f"intents/{intent_name}.json", _dump({
+                "id": _uuid(rng),
+                "name": intent_name,
+                "auto": True,
+                "contexts": [],
+                "responses": [{
+                    "resetContexts": False,
+                    "action": "",
+                    "affectedContexts": [],
+                    "parameters": [
+                        {
+                            "id": _uuid(rng),
+                            "name": entity,
+                            "required": False,
+                            "dataType": f"@{entity}",
+                            "value": f"${entity}",
+                            "defaultValue": "",
+                            "isList": False,
+                            "prompts": [],
+                            "promptMessages": [],
+                            "noMatchPromptMessages": [],
+                            "noInputPromptMessages": [],
+                            "outputDialogContexts": []
+                        }
+                        for entity in intent_entities
+                    ],
+                    "messages": [{"type": "0", "title": "", "textToSpeech": "", "lang": languages[0], "speech": [f"Jawaban {intent_name}"], "condition": ""}],
+                    "speech": []
+                }],
+                "priority": 500000,
+                "webhookUsed": False,
+                "webhookForSlotFilling": False,
+                "fallbackIntent": False,
+                "events": [],
+                "conditionalResponses": [],
+                "condition": "",
+                "conditionalFollowupEvents": []
+            }))
+
+            for lang in languages:
+                phrases = []
+                for _ in range(phrases_per_intent):
+                    data = [{"text": f"{_words(rng, 3)} ", "userDefined": False}]
+                    for entity in intent_entities:
+                        data.append({
+                            "text": rng.choice(entity_values[entity]),
+                            "alias": entity,
+                            "meta": f"@{entity}",
+                            "userDefined": False
+                        })
+                        data.append({"text": f" {_words(rng, 2)}", "userDefined": False})
+                    phrases.append({
+                        "id": _uuid(rng),
+                        "data": data,
+                        "isTemplate": False,
+                        "count": 0,
+                        "lang": lang,
+                        "updated": 0
+                    })
+                zf.writestr(f"intents/{intent_name}_usersays_{lang}.json", _dump(phrases))
+
+    return {
+        "intents": intents,
+        "phrases": intents * phrases_per_intent * len(languages),
+        "entity_types": entity_types,
+        "entries": entity_types * entries_per_entity * len(languages),
+        "languages": len(languages)
+    }
+
+def add_generator_arguments(parser):
+    """Register the synthetic agent size options on an argparse parser"""
+    parser.add_argument("--intents", type=int, default=50)
+    parser.add_argument("--phrases-per-intent", type=int, default=20)
+    parser.add_argument("--annotated-parts", type=int, default=1)
+    parser.add_argument("--entity-types", type=int, default=5)
+    parser.add_argument("--entries-per-entity", type=int, default=20)
+    parser.add_argument("--languages", default="id", help="Comma separated language codes, default language first")
+    parser.add_argument("--seed", type=int, default=0)
+
+def generator_kwargs(args):
+    """Turn parsed generator options into generate_es_agent keyword arguments"""
+    return {
+        "intents": args.intents,
+        "phrases_per_intent": args.phrases_per_intent,
+        "annotated_parts": args.annotated_parts,
+        "entity_types": args.entity_types,
+        "entries_per_entity": args.entries_per_entity,
+        "languages": [lang.strip() for lang in args.languages.split(",") if lang.strip()],
+        "seed": args.seed
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Dialogflow ES export ZIP")
+    parser.add_argument("zip_path")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    counts = generate_es_agent(args.zip_path, **generator_kwargs(args))
+    print(f"✅ Generated {args.zip_path}: {counts}")
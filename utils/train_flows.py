@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def train_flows(flows_client, agent_path, flow_names=None, poll_interval=2, max_poll_interval=30, timeout=1800):
+    """Train every flow's NLU model concurrently and wait for all of them.
+
+    All train_flow calls are started together, then the long-running
+    operations are polled as a group with exponential backoff. Returns
+    {flow display name: {"seconds": float, "error": str or None}}.
+    """
+    flows = {f.name: f.display_name for f in flows_client.list_flows(parent=agent_path)}
+    if flow_names is not None:
+        flows = {name: display for name, display in flows.items() if name in flow_names}
+    if not flows:
+        print("⚠️ No flows to train")
+        return {}
+
+    print(f"\n🧠 Training {len(flows)} flows...")
+    started = {}
+    results = {}
+
+    def start(flow_name):
+        started[flow_name] = time.monotonic()
+        return flows_client.train_flow(name=flow_name)
+
+    pending = {}
+    with ThreadPoolExecutor(max_workers=len(flows)) as pool:
+        for flow_name, future in [(name, pool.submit(start, name)) for name in flows]:
+            try:
+                pending[flow_name] = future.result()
+            except Exception as e:
+                results[flows[flow_name]] = {"seconds": 0.0, "error": str(e)}
+                print(f"❌ Failed to start training for {flows[flow_name]}: {e}")
+
+    deadline = time.monotonic() + timeout
+    delay = poll_interval
+    while pending:
+        time.sleep(delay)
+        for flow_name, operation in list(pending.items()):
+            try:
+                if not operation.done():
+                    continue
+                error = operation.exception()
+            except Exception as e:
+                error = e
+            seconds = time.monotonic() - started[flow_name]
+            results[flows[flow_name]] = {"seconds": round(seconds, 1), "error": str(error) if error else None}
+            del pending[flow_name]
+            if error:
+                print(f"❌ Training failed for {flows[flow_name]} after {seconds:.1f}s: {error}")
+            else:
+                print(f"✅ Trained {flows[flow_name]} in {seconds:.1f}s")
+
+        if pending and time.monotonic() > deadline:
+            for flow_name in pending:
+                results[flows[flow_name]] = {"seconds": round(time.monotonic() - started[flow_name], 1), "error": "timed out"}
+                print(f"⛔ Training timed out for {flows[flow_name]}")
+            break
+        delay = min(delay * 2, max_poll_interval)
+
+    return results
+
+def training_failed(results):
+    """True when any flow failed or did not finish training"""
+    return any(result["error"] for result in results.values())
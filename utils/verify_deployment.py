@@ -0,0 +1,150 @@
+import json
+import time
+from google.cloud import dialogflowcx_v3beta1 as dialogflowcx
+from utils.model import EntityType, Intent
+from utils.param_index import is_system_entity
+
+PAGE_SIZE = 1000
+
+def wait_for_entities(entity_client, agent_path, entity_names, max_retries=5, retry_delay=5):
+    """Wait until all entity names are listed, with one list call per attempt"""
+    missing = set(entity_names)
+    for attempt in range(max_retries):
+        try:
+            listed = {e.display_name for e in entity_client.list_entity_types(
+                request={"parent": agent_path, "page_size": PAGE_SIZE}
+            )}
+            missing -= listed
+            if not missing:
+                print(f"✓ All {len(entity_names)} entities verified (Attempt {attempt + 1})")
+                return set()
+            print(f"⚠️ Entities not found yet: {', '.join(sorted(missing))} (Attempt {attempt + 1})")
+        except Exception as e:
+            print(f"⚠️ Error listing entities: {str(e)}")
+
+        if attempt < max_retries - 1:
+            time.sleep(retry_delay)
+
+    return missing
+
+def fetch_deployed(entity_client, intents_client, agent_path, language_code=None):
+    """Pull every entity type and intent of one language with one paginated list each"""
+    entity_types = list(entity_client.list_entity_types(request={
+        "parent": agent_path,
+        "language_code": language_code,
+        "page_size": PAGE_SIZE
+    }))
+    intents = list(intents_client.list_intents(request={
+        "parent": agent_path,
+        "language_code": language_code,
+        "intent_view": dialogflowcx.IntentView.INTENT_VIEW_FULL,
+        "page_size": PAGE_SIZE
+    }))
+
+    # Parameters reference entity types by resource name, report them by display name
+    entity_names = {e.name: e.display_name for e in entity_types}
+    deployed_intents = {}
+    for proto in intents:
+        intent = Intent.from_proto(proto, language_code)
+        for param in intent.parameters:
+            param.entity_type = entity_names.get(param.entity_type) or _system_entity(param.entity_type)
+        deployed_intents[intent.display_name] = intent
+
+    return (
+        {e.display_name: EntityType.from_proto(e, language_code) for e in entity_types},
+        deployed_intents
+    )
+
+def _system_entity(entity_type):
+    """Turn '.../entityTypes/sys.location' into '@sys.location'"""
+    short_name = entity_type.rsplit("/", 1)[-1]
+    return f"@{short_name}" if short_name.startswith("sys.") else entity_type
+
+def _expected_binding(param, entity_names):
+    """Entity a local parameter should be bound to once deployed, None if it gets dropped"""
+    if is_system_entity(param.entity_type):
+        return param.entity_type
+    name = param.entity_type[1:]
+    return name if name in entity_names else None
+
+def diff_resources(local_entities, local_intents, deployed_entities, deployed_intents):
+    """Compare local and deployed resources in memory, local_entities=None skips entities"""
+    report = {
+        "missing_entities": [],
+        "entity_entries": [],
+        "missing_intents": [],
+        "phrase_counts": [],
+        "parameter_bindings": []
+    }
+
+    for name, local in sorted((local_entities or {}).items()):
+        deployed = deployed_entities.get(name)
+        if not deployed:
+            report["missing_entities"].append(name)
+            continue
+        local_values = {e.value: set(e.synonyms) for e in local.entities}
+        deployed_values = {e.value: set(e.synonyms) for e in deployed.entities}
+        missing_values = local_values.keys() - deployed_values.keys()
+        changed_values = [v for v in local_values.keys() & deployed_values.keys() if local_values[v] - deployed_values[v]]
+        if missing_values or changed_values:
+            report["entity_entries"].append({
+                "entity": name,
+                "missing_values": sorted(missing_values),
+                "missing_synonyms": sorted(changed_values)
+            })
+
+    entity_names = set(local_entities or deployed_entities)
+    for name, local in sorted(local_intents.items()):
+        deployed = deployed_intents.get(name)
+        if not deployed:
+            report["missing_intents"].append(name)
+            continue
+        if len(local.training_phrases) != len(deployed.training_phrases):
+            report["phrase_counts"].append({
+                "intent": name,
+                "local": len(local.training_phrases),
+                "deployed": len(deployed.training_phrases)
+            })
+
+        deployed_bindings = {p.id: p.entity_type for p in deployed.parameters}
+        for param in local.parameters:
+            expected = _expected_binding(param, entity_names)
+            actual = deployed_bindings.get(param.id)
+            if expected != actual:
+                report["parameter_bindings"].append({
+                    "intent": name,
+                    "parameter": param.id,
+                    "expected": expected,
+                    "deployed": actual
+                })
+
+    return report
+
+def verify_deployment(entity_client, intents_client, agent_path, local_by_language, report_path=None):
+    """Diff deployed agent state against local resources per language, return the report"""
+    print("\n🔍 Verifying deployed agent state...")
+    full_report = {}
+    for language_code, (local_entities, local_intents) in local_by_language.items():
+        deployed_entities, deployed_intents = fetch_deployed(entity_client, intents_client, agent_path, language_code)
+        report = diff_resources(local_entities, local_intents, deployed_entities, deployed_intents)
+        full_report[language_code] = report
+
+        problems = sum(len(items) for items in report.values())
+        checked = f"{len(local_entities or {})} entities, {len(local_intents)} intents"
+        if problems:
+            print(f"❌ [{language_code}] {problems} differences ({checked})")
+            for category, items in report.items():
+                for item in items:
+                    print(f"  - {category}: {item}")
+        else:
+            print(f"✅ [{language_code}] Deployed state matches ({checked})")
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(full_report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Diff report written to {report_path}")
+    return full_report
+
+def has_differences(report):
+    """True when any language in a verification report has a difference"""
+    return any(items for language_report in report.values() for items in language_report.values())
@@ -1,26 +1,64 @@
 import json
 from pathlib import Path
+from utils.model import EntityType, Intent
 
-def verify_conversion():
-    print("🔍 Verifying conversion results...")
-    
-    # Check entities
-    entity_files = list(Path("output_cx/entities").glob("*.json"))
-    print(f"\n✅ Found {len(entity_files)} entity files:")
-    for ef in entity_files:
-        with open(ef, 'r', encoding='utf-8') as f:
+def load_languages(output_dir: str = "output_cx"):
+    """Return (default_language, languages) recorded by the converter"""
+    manifest = Path(output_dir) / "languages.json"
+    if manifest.exists():
+        with open(manifest, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        print(f"  - {ef.name}: {len(data['entities'])} entries")
+        return data["default_language"], data["languages"]
+    languages = sorted(p.name for p in Path(output_dir).iterdir() if (p / "intents").is_dir())
+    return (languages[0] if languages else "id"), languages
 
-    # Check intents
-    intent_files = list(Path("output_cx/intents").glob("*.json"))
-    print(f"\n✅ Found {len(intent_files)} intent files:")
-    for itf in intent_files:
-        with open(itf, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"  - {itf.name}: {len(data['training_phrases'])} training phrases")
-        if "parameters" in data:
-            print(f"    Parameters: {[p['id'] for p in data['parameters']]}")
+def load_local(output_dir, language_code):
+    """Load the converted resources of one language from output_cx"""
+    shard_dir = Path(output_dir) / language_code
+    entities, intents = {}, {}
+    for entity_file in (shard_dir / "entities").glob("*.json"):
+        with open(entity_file, 'r', encoding='utf-8') as f:
+            entity = EntityType.from_dict(json.load(f))
+        entities[entity.display_name] = entity
+    for intent_file in (shard_dir / "intents").glob("*.json"):
+        with open(intent_file, 'r', encoding='utf-8') as f:
+            intent = Intent.from_dict(json.load(f))
+        intents[intent.display_name] = intent
+    return entities, intents
+
+def save_local_intents(output_dir, language_code, intents):
+    """Write intents back to one language of output_cx in the layout load_local reads"""
+    intents_dir = Path(output_dir) / language_code / "intents"
+    intents_dir.mkdir(parents=True, exist_ok=True)
+    for intent in intents:
+        with open(intents_dir / f"{intent.display_name}.json", 'w', encoding='utf-8') as f:
+            json.dump(intent.to_dict(), f, indent=2, ensure_ascii=False)
+
+def verify_conversion(output_dir: str = "output_cx"):
+    print("🔍 Verifying conversion results...")
+
+    default_language, languages = load_languages(output_dir)
+    for lang in languages:
+        shard_dir = Path(output_dir) / lang
+        print(f"\n🌐 Language: {lang}{' (default)' if lang == default_language else ''}")
+
+        # Check entities
+        entity_files = list((shard_dir / "entities").glob("*.json"))
+        print(f"\n✅ Found {len(entity_files)} entity files:")
+        for ef in entity_files:
+            with open(ef, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            print(f"  - {ef.name}: {len(data['entities'])} entries")
+
+        # Check intents
+        intent_files = list((shard_dir / "intents").glob("*.json"))
+        print(f"\n✅ Found {len(intent_files)} intent files:")
+        for itf in intent_files:
+            with open(itf, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            print(f"  - {itf.name}: {len(data['training_phrases'])} training phrases")
+            if "parameters" in data:
+                print(f"    Parameters: {[p['id'] for p in data['parameters']]}")
 
 if __name__ == "__main__":
     verify_conversion()
\ No newline at end of file